@@ -0,0 +1,83 @@
+# bench/common.py
+#
+# Shared setup for the benchmarks. Benchmarks that need PostgreSQL read
+# BENCH_DATABASE_URL, which must name a disposable database: its public
+# schema is dropped and rebuilt on every run.
+import os
+import sys
+import time
+
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL")
+if BENCH_DATABASE_URL:
+    os.environ["DATABASE_URL"] = BENCH_DATABASE_URL
+os.environ["SCHEDULER_ENABLED"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.schema import CreateIndex, CreateTable  # noqa: E402
+
+
+def require_database():
+    if not BENCH_DATABASE_URL:
+        sys.exit("Set BENCH_DATABASE_URL to a disposable PostgreSQL database")
+
+
+async def reset_database():
+    """Connect and rebuild the schema from the table definitions and migrations"""
+    await main.database.connect()
+    await main.database.execute("DROP SCHEMA public CASCADE")
+    await main.database.execute("CREATE SCHEMA public")
+    dialect = postgresql.dialect()
+    for table in main.metadata.sorted_tables:
+        await main.database.execute(str(CreateTable(table).compile(dialect=dialect)))
+        for index in table.indexes:
+            await main.database.execute(str(CreateIndex(index).compile(dialect=dialect)))
+    await main.run_migrations()
+
+
+async def truncate_tables():
+    tables = ", ".join(table.name for table in main.metadata.sorted_tables)
+    await main.database.execute(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+
+
+class QueryCounter:
+    """Count round trips made through `main.database` while active"""
+
+    METHODS = ("fetch_all", "fetch_one", "fetch_val", "execute", "execute_many")
+
+    def __init__(self):
+        self.queries = 0
+        self.originals = {}
+
+    def __enter__(self):
+        for name in self.METHODS:
+            original = getattr(main.database, name)
+            self.originals[name] = original
+
+            def counted(*args, _original=original, **kwargs):
+                self.queries += 1
+                return _original(*args, **kwargs)
+
+            setattr(main.database, name, counted)
+        return self
+
+    def __exit__(self, *exc):
+        for name, original in self.originals.items():
+            setattr(main.database, name, original)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Timer:
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.started
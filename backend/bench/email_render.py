@@ -0,0 +1,52 @@
+# bench/email_render.py
+#
+# Render throughput of each precompiled email template, one recipient at a
+# time and as a batch through render_many. Needs no database.
+#
+#   python -m bench.email_render
+import os
+import time
+
+from bench.common import main
+
+RECIPIENTS = int(os.getenv("BENCH_RECIPIENTS", "20000"))
+GAMES_PER_DIGEST = 5
+
+
+def throughput(render, count):
+    started = time.perf_counter()
+    render()
+    return count / (time.perf_counter() - started)
+
+
+def bench():
+    users = [{"username": f"user{i} <&>"} for i in range(RECIPIENTS)]
+    games = [
+        {
+            "away_team": f"Away {g} & Co",
+            "home_team": f"Home {g}",
+            "game_time": "2024-09-08 17:00",
+            "venue": f"Stadium {g}",
+            "picked_team": f"Home {g}",
+            "league_name": f"League {g % 20}"
+        }
+        for g in range(RECIPIENTS)
+    ]
+    rows_html = "".join(main.GAME_UPDATED_ROW.render(game) for game in games[:GAMES_PER_DIGEST])
+    digests = [{"username": user["username"], "games_html": rows_html} for user in users]
+
+    cases = [
+        ("REMIND_PICKS_EMAIL", main.REMIND_PICKS_EMAIL, users),
+        ("GAME_UPDATED_ROW", main.GAME_UPDATED_ROW, games),
+        ("GAME_UPDATED_EMAIL", main.GAME_UPDATED_EMAIL, digests),
+    ]
+    print(f"{RECIPIENTS} renders per case")
+    print(f"{'template':>20} {'render/s':>12} {'render_many/s':>14}")
+    for name, template, rows in cases:
+        single = throughput(lambda: [template.render(row) for row in rows], len(rows))
+        batch = throughput(lambda: template.render_many(rows), len(rows))
+        print(f"{name:>20} {single:>12,.0f} {batch:>14,.0f}")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,82 @@
+# bench/login_latency.py
+#
+# Login throughput against the latency of an unrelated endpoint while a
+# login spike is in progress. Runs twice: with bcrypt on the bounded worker
+# pool (as served) and with bcrypt called inline on the event loop (the old
+# behaviour), so the effect on everything else the worker serves is visible.
+#
+#   BENCH_DATABASE_URL=postgresql://postgres@localhost/pickem_bench python -m bench.login_latency
+import asyncio
+import os
+
+import httpx
+
+from bench.common import main, percentile, require_database, reset_database
+
+LOGIN_CLIENTS = int(os.getenv("BENCH_LOGIN_CLIENTS", "16"))
+DURATION_SECONDS = float(os.getenv("BENCH_DURATION_SECONDS", "5"))
+PROBE_INTERVAL_SECONDS = 0.01
+PASSWORD = "correct horse battery staple"
+
+
+async def inline_password_job(func, *args):
+    return func(*args)
+
+
+async def run_spike(client: httpx.AsyncClient):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + DURATION_SECONDS
+    logins = []
+    probes = []
+
+    async def login_client():
+        while loop.time() < deadline:
+            response = await client.post("/token", data={"username": "bench", "password": PASSWORD})
+            if response.status_code == 200:
+                logins.append(loop.time())
+
+    async def probe():
+        # Latency is measured from when the probe was due, so time spent
+        # waiting for a blocked event loop to wake it up counts as well
+        due = loop.time()
+        while due < deadline:
+            await asyncio.sleep(max(0.0, due - loop.time()))
+            await client.get("/api/keep-alive")
+            finished = loop.time()
+            probes.append(finished - due)
+            due = max(due + PROBE_INTERVAL_SECONDS, finished)
+
+    await asyncio.gather(probe(), *(login_client() for _ in range(LOGIN_CLIENTS)))
+    return len(logins) / DURATION_SECONDS, probes
+
+
+async def bench():
+    await reset_database()
+    await main.database.execute(
+        """
+        INSERT INTO users (username, email, password_hash, created_at, updated_at)
+        VALUES ('bench', 'bench@example.com', :password_hash, now(), now())
+        """,
+        values={"password_hash": main._hash_password(PASSWORD)}
+    )
+
+    print(f"bcrypt rounds {main.BCRYPT_ROUNDS}, {main.PASSWORD_HASH_WORKERS} pool workers, "
+          f"{LOGIN_CLIENTS} concurrent login clients, {DURATION_SECONDS:.0f}s per run")
+    print(f"{'mode':>8} {'logins/s':>9} {'probe p50 ms':>13} {'probe p99 ms':>13} {'probe max ms':>13}")
+    pooled = main.run_password_job
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode, job in (("pool", pooled), ("inline", inline_password_job)):
+            main.run_password_job = job
+            try:
+                throughput, probes = await run_spike(client)
+            finally:
+                main.run_password_job = pooled
+            print(f"{mode:>8} {throughput:>9.1f} {percentile(probes, 0.5) * 1000:>13.1f} "
+                  f"{percentile(probes, 0.99) * 1000:>13.1f} {max(probes) * 1000:>13.1f}")
+    await main.database.disconnect()
+
+
+if __name__ == "__main__":
+    require_database()
+    asyncio.run(bench())
@@ -0,0 +1,99 @@
+# bench/standings_queries.py
+#
+# Round trips and wall time of recalculate_week_standings as league size
+# grows. The query count must stay flat: one statement for the week's rows
+# and one for the season rollup, whatever the member count.
+#
+#   BENCH_DATABASE_URL=postgresql://postgres@localhost/pickem_bench python -m bench.standings_queries
+import asyncio
+import sys
+
+from bench.common import QueryCounter, Timer, main, require_database, reset_database, truncate_tables
+
+MEMBER_COUNTS = [10, 50, 100, 400, 1000]
+GAMES_PER_WEEK = 16
+SPORT_ID = 1
+SEASON = "2024"
+WEEK = 1
+
+
+async def seed_league(members: int) -> int:
+    await truncate_tables()
+    await main.database.execute(
+        "INSERT INTO sports (id, name, espn_id, current_season, current_week) VALUES (1, 'nfl', 1, 2024, 1)"
+    )
+    await main.database.execute(
+        """
+        INSERT INTO users (username, email, password_hash, created_at, updated_at)
+        SELECT 'user' || i, 'user' || i || '@example.com', 'x', now(), now()
+        FROM generate_series(1, :members) AS i
+        """,
+        values={"members": members}
+    )
+    league_id = await main.database.fetch_val(
+        """
+        INSERT INTO leagues (name, created_by, tiebreaker_enabled, invite_code, created_at, updated_at)
+        VALUES ('bench', 1, true, 'bench', now(), now())
+        RETURNING id
+        """
+    )
+    await main.database.execute(
+        """
+        INSERT INTO league_members (league_id, user_id, is_admin, joined_at)
+        SELECT :league_id, i, i = 1, now() FROM generate_series(1, :members) AS i
+        """,
+        values={"league_id": league_id, "members": members}
+    )
+    # Every game final, home team winning by 7 with a 3.5 point spread
+    await main.database.execute(
+        """
+        INSERT INTO games (sport_id, espn_game_id, home_team, away_team, home_team_score,
+                           away_team_score, spread, favorite, game_time, venue, season, week,
+                           status, last_updated)
+        SELECT 1, 'g' || g, 'home' || g, 'away' || g, '24', '17', 3.5, 'home' || g,
+               now() - interval '1 day', 'venue', 2024, 1, 'STATUS_FINAL', now()
+        FROM generate_series(1, :games) AS g
+        """,
+        values={"games": GAMES_PER_WEEK}
+    )
+    # Members alternate between picking the home and the away side
+    await main.database.execute(
+        """
+        INSERT INTO picks (user_id, league_id, game_id, picked_team, created_at, updated_at)
+        SELECT lm.user_id, lm.league_id, g.id,
+               CASE WHEN (lm.user_id + g.id) % 2 = 0 THEN g.home_team ELSE g.away_team END,
+               now(), now()
+        FROM league_members lm CROSS JOIN games g
+        WHERE lm.league_id = :league_id
+        """,
+        values={"league_id": league_id}
+    )
+    await main.database.execute("ANALYZE")
+    return league_id
+
+
+async def bench():
+    await reset_database()
+    print(f"{'members':>8} {'picks':>7} {'queries':>8} {'ms':>9}")
+    counts = set()
+    for members in MEMBER_COUNTS:
+        league_id = await seed_league(members)
+        with QueryCounter() as counter, Timer() as timer:
+            await main.recalculate_week_standings(league_id, SPORT_ID, SEASON, WEEK)
+        counts.add(counter.queries)
+        incomplete = await main.database.fetch_val(
+            "SELECT COUNT(*) FROM league_standings WHERE wins + losses + ties <> :games",
+            values={"games": GAMES_PER_WEEK}
+        )
+        if incomplete:
+            sys.exit(f"{incomplete} members were not scored on every game")
+        print(f"{members:>8} {members * GAMES_PER_WEEK:>7} {counter.queries:>8} {timer.elapsed * 1000:>9.1f}")
+    await main.database.disconnect()
+    if len(counts) != 1:
+        sys.exit(f"Query count varies with member count: {sorted(counts)}")
+    print(f"Query count is flat at {counts.pop()} per recalculation")
+
+
+if __name__ == "__main__":
+    require_database()
+    asyncio.run(bench())
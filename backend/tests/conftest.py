@@ -0,0 +1,222 @@
+# tests/conftest.py
+#
+# These tests run against a real PostgreSQL database, because what they check
+# (query plans, locking, upsert semantics) only exists there. Point
+# TEST_DATABASE_URL at a disposable database: its public schema is dropped
+# and rebuilt at the start of every session.
+#
+#   TEST_DATABASE_URL=postgresql://postgres@localhost/pickem_test python -m pytest -q tests
+import asyncio
+import os
+import sys
+
+import httpx
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if not TEST_DATABASE_URL:
+    collect_ignore_glob = ["test_*.py"]
+else:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+    os.environ["SCHEDULER_ENABLED"] = "false"
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    import main
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateIndex, CreateTable
+
+
+async def create_schema():
+    """Rebuild the schema from the table definitions, then apply the migrations"""
+    await main.database.execute("DROP SCHEMA public CASCADE")
+    await main.database.execute("CREATE SCHEMA public")
+    dialect = postgresql.dialect()
+    for table in main.metadata.sorted_tables:
+        await main.database.execute(str(CreateTable(table).compile(dialect=dialect)))
+        for index in table.indexes:
+            await main.database.execute(str(CreateIndex(index).compile(dialect=dialect)))
+    await main.run_migrations()
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(main.database.connect())
+    loop.run_until_complete(create_schema())
+    yield loop
+    loop.run_until_complete(main.database.disconnect())
+    loop.close()
+
+
+@pytest.fixture
+def run(loop):
+    """Run a coroutine on the session's event loop, where `database` is connected"""
+    return loop.run_until_complete
+
+
+async def truncate_tables():
+    tables = ", ".join(table.name for table in main.metadata.sorted_tables)
+    await main.database.execute(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+
+
+@pytest.fixture
+def clean(run):
+    """Empty every table and the in-process caches before a test"""
+    run(truncate_tables())
+    main.principal_cache.clear()
+    main.membership_cache.clear()
+    main.games_cache.clear()
+    main.games_cache_stats["bytes"] = 0
+
+
+class Seed:
+    """Small helpers for inserting rows the tests need"""
+
+    def __init__(self, run):
+        self.run = run
+
+    def fetch_val(self, query, **values):
+        return self.run(main.database.fetch_val(query, values=values))
+
+    def user(self, username):
+        return self.fetch_val(
+            """
+            INSERT INTO users (username, email, password_hash, display_name, created_at, updated_at)
+            VALUES (:username, :email, 'x', :username, (now() AT TIME ZONE 'utc'), (now() AT TIME ZONE 'utc'))
+            RETURNING id
+            """,
+            username=username, email=f"{username}@example.com"
+        )
+
+    def league(self, name, admin_id):
+        league_id = self.fetch_val(
+            """
+            INSERT INTO leagues (name, created_by, tiebreaker_enabled, invite_code, created_at, updated_at)
+            VALUES (:name, :admin_id, false, :invite_code, (now() AT TIME ZONE 'utc'), (now() AT TIME ZONE 'utc'))
+            RETURNING id
+            """,
+            name=name, admin_id=admin_id, invite_code=name[:20]
+        )
+        self.member(league_id, admin_id, is_admin=True)
+        return league_id
+
+    def member(self, league_id, user_id, is_admin=False):
+        return self.fetch_val(
+            """
+            INSERT INTO league_members (league_id, user_id, is_admin, joined_at)
+            VALUES (:league_id, :user_id, :is_admin, (now() AT TIME ZONE 'utc'))
+            RETURNING id
+            """,
+            league_id=league_id, user_id=user_id, is_admin=is_admin
+        )
+
+    def sport(self, sport_id=1, season=2024, week=1):
+        return self.fetch_val(
+            """
+            INSERT INTO sports (id, name, espn_id, current_season, current_week)
+            VALUES (:id, :name, :id, :season, :week)
+            RETURNING id
+            """,
+            id=sport_id, name=f"sport-{sport_id}", season=season, week=week
+        )
+
+    def league_sport(self, league_id, sport_id):
+        return self.fetch_val(
+            """
+            INSERT INTO league_sports (league_id, sport_id, active)
+            VALUES (:league_id, :sport_id, true)
+            RETURNING id
+            """,
+            league_id=league_id, sport_id=sport_id
+        )
+
+    def game(self, sport_id, season, week, game_time, home="Home", away="Away",
+             home_score="0", away_score="0", status="STATUS_SCHEDULED", espn_game_id=None):
+        return self.fetch_val(
+            """
+            INSERT INTO games (sport_id, espn_game_id, home_team, away_team, home_team_score,
+                               away_team_score, spread, favorite, game_time, venue, season,
+                               week, status, last_updated)
+            VALUES (:sport_id, :espn_game_id, :home, :away, :home_score, :away_score, 0, '',
+                    :game_time, 'Stadium', :season, :week, :status, (now() AT TIME ZONE 'utc'))
+            RETURNING id
+            """,
+            sport_id=sport_id, espn_game_id=espn_game_id, home=home, away=away,
+            home_score=home_score, away_score=away_score, game_time=game_time,
+            season=season, week=week, status=status
+        )
+
+    def pick(self, user_id, league_id, game_id, picked_team):
+        return self.fetch_val(
+            """
+            INSERT INTO picks (user_id, league_id, game_id, picked_team, created_at, updated_at)
+            VALUES (:user_id, :league_id, :game_id, :picked_team, (now() AT TIME ZONE 'utc'), (now() AT TIME ZONE 'utc'))
+            RETURNING id
+            """,
+            user_id=user_id, league_id=league_id, game_id=game_id, picked_team=picked_team
+        )
+
+    def notification(self, user_id, notification_type="REMIND_PICKS", scheduled_for=None, attempts=0):
+        return self.fetch_val(
+            """
+            INSERT INTO email_notifications (user_id, notification_type, processed, scheduled_for,
+                                             created_at, attempts)
+            VALUES (:user_id, :notification_type, false, COALESCE(:scheduled_for, (now() AT TIME ZONE 'utc') - interval '1 minute'),
+                    (now() AT TIME ZONE 'utc'), :attempts)
+            RETURNING id
+            """,
+            user_id=user_id, notification_type=notification_type,
+            scheduled_for=scheduled_for, attempts=attempts
+        )
+
+
+@pytest.fixture
+def seed(run, clean):
+    return Seed(run)
+
+
+@pytest.fixture
+def query_count(monkeypatch):
+    """Count database round trips made through `database`"""
+    counter = {"queries": 0}
+    for name in ("fetch_all", "fetch_one", "fetch_val", "execute"):
+        original = getattr(main.database, name)
+
+        def counted(*args, _original=original, **kwargs):
+            counter["queries"] += 1
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(main.database, name, counted)
+    return counter
+
+
+class Api:
+    """Call the app over ASGI as a given user, so query strings and bodies are
+    parsed exactly as FastAPI parses real requests"""
+
+    def __init__(self, run):
+        self.run = run
+
+    def request(self, method, url, user_id, **kwargs):
+        async def send():
+            user = dict(await main.get_user_by_id(user_id))
+            main.app.dependency_overrides[main.get_current_user] = lambda: user
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.request(method, url, **kwargs)
+
+        try:
+            return self.run(send())
+        finally:
+            main.app.dependency_overrides.clear()
+
+    def get(self, url, user_id, **kwargs):
+        return self.request("GET", url, user_id, **kwargs)
+
+    def post(self, url, user_id, **kwargs):
+        return self.request("POST", url, user_id, **kwargs)
+
+
+@pytest.fixture
+def api(run, clean):
+    return Api(run)
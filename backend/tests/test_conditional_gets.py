@@ -0,0 +1,60 @@
+# tests/test_conditional_gets.py
+#
+# The read endpoints through the ASGI app, with parameters typed the way
+# FastAPI delivers them from a real query string.
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def week(run, seed):
+    alice = seed.user("alice")
+    league_id = seed.league("league", alice)
+    seed.sport(1)
+    seed.league_sport(league_id, 1)
+    game_id = seed.game(1, 2024, 1, datetime.utcnow() + timedelta(days=1), status="STATUS_FINAL",
+                        home_score="21", away_score="14")
+    seed.pick(alice, league_id, game_id, "Home")
+    run(main.recalculate_week_standings(league_id, 1, "2024", 1))
+    return {"user_id": alice, "league_id": league_id, "game_id": game_id}
+
+
+def revalidate(api, url, user_id):
+    first = api.get(url, user_id)
+    assert first.status_code == 200, first.text
+    etag = first.headers["etag"]
+    second = api.get(url, user_id, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    return first.json()
+
+
+def test_games(api, week):
+    body = revalidate(api, "/api/games?sport_id=1&season=2024&week=1", week["user_id"])
+    assert [game["id"] for game in body["games"]] == [week["game_id"]]
+
+
+def test_games_rejects_a_non_numeric_season(api, week):
+    response = api.get("/api/games?sport_id=1&season=latest&week=1", week["user_id"])
+    assert response.status_code == 400
+
+
+def test_picks(api, week):
+    url = f"/api/picks?league_id={week['league_id']}&sport_id=1&season=2024&week=1"
+    body = revalidate(api, url, week["user_id"])
+    assert [pick["game_id"] for pick in body["picks"]] == [week["game_id"]]
+
+
+@pytest.mark.parametrize("week_param", ["&week=1", ""])
+def test_standings(api, week, week_param):
+    url = f"/api/standings?league_id={week['league_id']}&sport_id=1&season=2024{week_param}"
+    body = revalidate(api, url, week["user_id"])
+    assert body["standings"][0]["user_id"] == week["user_id"]
+
+
+def test_leagues(api, week):
+    body = revalidate(api, "/api/leagues", week["user_id"])
+    assert [league["id"] for league in body["leagues"]] == [week["league_id"]]
@@ -0,0 +1,67 @@
+# tests/test_live_listener.py
+import asyncio
+
+import main
+
+
+async def wait_for(condition, timeout=10):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.05)
+
+
+def test_listener_reconnects_and_resyncs(run, clean):
+    key = main.live_games_key(1, "2024", 1)
+    queue = asyncio.Queue(maxsize=main.LIVE_QUEUE_SIZE)
+    main.live_subscribers.setdefault(key, set()).add(queue)
+    run(main.start_live_listener())
+    try:
+        run(wait_for(lambda: main.live_listener_stats["connected"]))
+        connects = main.live_listener_stats["connects"]
+        main.store_games_response(key, b"{}", '"tag"', 0.0)
+        while not queue.empty():
+            queue.get_nowait()
+
+        # Killing the backend must be noticed without any traffic on it
+        pid = main.live_connection.get_server_pid()
+        run(main.database.execute("SELECT pg_terminate_backend(:pid)", values={"pid": pid}))
+        run(wait_for(lambda: main.live_listener_stats["connects"] > connects))
+
+        assert main.live_listener_stats["connected"]
+        assert main.live_connection.get_server_pid() != pid
+        assert key not in main.games_cache
+        assert queue.get_nowait().startswith("event: resync")
+
+        # Notifications flow again on the new connection
+        run(main.database.execute(
+            "SELECT pg_notify(:channel, :payload)",
+            values={"channel": main.LIVE_GAMES_CHANNEL,
+                    "payload": '{"sport_id": 1, "season": "2024", "week": 1}'}
+        ))
+        event = run(asyncio.wait_for(queue.get(), timeout=5))
+        assert event.startswith("event: game")
+    finally:
+        run(main.stop_live_listener())
+        main.live_subscribers.pop(key, None)
+
+    assert main.live_connection is None
+    assert not main.live_listener_stats["connected"]
+
+
+def test_moved_game_reaches_both_weeks(clean):
+    old_key = main.live_games_key(1, "2024", 1)
+    new_key = main.live_games_key(1, "2024", 2)
+    queues = {key: asyncio.Queue(maxsize=main.LIVE_QUEUE_SIZE) for key in (old_key, new_key)}
+    for key, queue in queues.items():
+        main.live_subscribers.setdefault(key, set()).add(queue)
+    try:
+        main.publish_game_update(None, 0, main.LIVE_GAMES_CHANNEL, main.json.dumps({
+            "sport_id": 1, "season": 2024, "week": 2, "previous_season": 2024, "previous_week": 1
+        }))
+    finally:
+        for key, queue in queues.items():
+            main.live_subscribers.pop(key, None)
+
+    for queue in queues.values():
+        assert queue.get_nowait().startswith("event: game")
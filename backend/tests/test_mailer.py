@@ -0,0 +1,104 @@
+# tests/test_mailer.py
+#
+# The SMTP pool against a small local debugging server, which counts the
+# connections it sees and the messages it accepts.
+import asyncio
+import base64
+
+import pytest
+
+import main
+
+USERNAME = "mailer"
+PASSWORD = "secret"
+
+
+class DebugSMTPServer:
+    def __init__(self):
+        self.opened = 0
+        self.open = 0
+        self.messages = 0
+
+    async def handle(self, reader, writer):
+        self.opened += 1
+        self.open += 1
+        try:
+            writer.write(b"220 localhost ESMTP debug\r\n")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode().strip()
+                verb = command.split(" ", 1)[0].upper()
+                if verb in ("EHLO", "HELO"):
+                    writer.write(b"250-localhost\r\n250 AUTH PLAIN\r\n")
+                elif verb == "AUTH":
+                    _, user, password = base64.b64decode(command.split()[-1]).split(b"\0")
+                    if (user.decode(), password.decode()) == (USERNAME, PASSWORD):
+                        writer.write(b"235 2.7.0 Authentication successful\r\n")
+                    else:
+                        writer.write(b"535 5.7.8 Authentication failed\r\n")
+                elif verb == "DATA":
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    while await reader.readline() not in (b".\r\n", b""):
+                        pass
+                    self.messages += 1
+                    writer.write(b"250 OK\r\n")
+                elif verb == "QUIT":
+                    writer.write(b"221 Bye\r\n")
+                    await writer.drain()
+                    break
+                else:
+                    writer.write(b"250 OK\r\n")
+                await writer.drain()
+        finally:
+            self.open -= 1
+            writer.close()
+
+
+@pytest.fixture
+def smtp_server(run, monkeypatch):
+    server = DebugSMTPServer()
+    listener = run(asyncio.start_server(server.handle, "127.0.0.1", 0))
+    monkeypatch.setattr(main, "EMAIL_HOST", "127.0.0.1")
+    monkeypatch.setattr(main, "EMAIL_PORT", listener.sockets[0].getsockname()[1])
+    monkeypatch.setattr(main, "EMAIL_USE_TLS", False)
+    monkeypatch.setattr(main, "EMAIL_USERNAME", USERNAME)
+    monkeypatch.setattr(main, "EMAIL_PASSWORD", PASSWORD)
+    monkeypatch.setattr(main, "EMAIL_RETRY_BACKOFF_SECONDS", 0)
+    yield server
+    run(main.close_smtp_pool())
+    listener.close()
+    run(listener.wait_closed())
+
+
+async def settle(server, open_connections):
+    for _ in range(100):
+        if server.open == open_connections:
+            return
+        await asyncio.sleep(0.01)
+
+
+def test_pool_reuses_authenticated_connections(run, smtp_server):
+    messages = [(f"user{i}@example.com", "Subject", "<p>Hello</p>") for i in range(20)]
+
+    assert run(main.send_emails(messages)) == [True] * 20
+    assert smtp_server.messages == 20
+    assert smtp_server.opened <= main.EMAIL_POOL_SIZE
+
+    run(main.close_smtp_pool())
+    run(settle(smtp_server, 0))
+    assert smtp_server.open == 0
+
+
+def test_failed_login_closes_its_connection(run, smtp_server, monkeypatch):
+    monkeypatch.setattr(main, "EMAIL_PASSWORD", "wrong")
+
+    assert run(main.send_email("user@example.com", "Subject", "<p>Hello</p>")) is False
+    run(settle(smtp_server, 0))
+
+    assert smtp_server.opened == 1
+    assert smtp_server.open == 0
+    assert smtp_server.messages == 0
+    assert main.smtp_idle_connections == []
@@ -0,0 +1,57 @@
+# tests/test_membership.py
+import asyncio
+
+import main
+
+
+def gate_role_queries(monkeypatch):
+    """Hold the first role query until the returned event is set"""
+    release = asyncio.Event()
+    original = main.database.fetch_one
+    calls = {"count": 0}
+
+    async def gated(query, values=None):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            await release.wait()
+        return await original(query, values=values)
+
+    monkeypatch.setattr(main.database, "fetch_one", gated)
+    return release, calls
+
+
+def test_cancelled_owner_does_not_strand_waiters(run, seed, monkeypatch):
+    admin_id = seed.user("admin")
+    league_id = seed.league("league", admin_id)
+    release, calls = gate_role_queries(monkeypatch)
+
+    async def scenario():
+        owner = asyncio.create_task(main.get_league_role(league_id, admin_id))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(main.get_league_role(league_id, admin_id))
+        await asyncio.sleep(0)
+        owner.cancel()
+        release.set()
+        return await asyncio.wait_for(waiter, timeout=5)
+
+    assert run(scenario()) is True
+    assert calls["count"] == 2
+
+
+def test_lookup_racing_an_invalidation_is_not_cached(run, seed, monkeypatch):
+    admin_id = seed.user("admin")
+    league_id = seed.league("league", admin_id)
+    user_id = seed.user("bob")
+    release, _ = gate_role_queries(monkeypatch)
+
+    async def scenario():
+        # A join or leave evicts the key while the lookup is in flight
+        lookup = asyncio.create_task(main.get_league_role(league_id, user_id))
+        while (league_id, user_id) not in main.membership_lookups:
+            await asyncio.sleep(0)
+        main.invalidate_membership(league_id, user_id)
+        release.set()
+        return await lookup
+
+    assert run(scenario()) is None
+    assert (league_id, user_id) not in main.membership_cache
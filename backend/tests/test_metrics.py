@@ -0,0 +1,38 @@
+# tests/test_metrics.py
+import asyncio
+
+import httpx
+
+import main
+from test_live_listener import wait_for
+
+
+def test_metrics_require_authentication(run, clean):
+    async def fetch():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/metrics")
+
+    assert run(fetch()).status_code == 401
+
+
+def test_metrics_do_not_expose_connection_errors(run, seed, api, monkeypatch):
+    user_id = seed.user("alice")
+    monkeypatch.setattr(main, "ASYNCPG_DSN", "postgresql://secret-user@127.0.0.1:1/secret-db")
+    monkeypatch.setitem(main.live_listener_stats, "last_error", None)
+
+    async def fail_once():
+        task = asyncio.create_task(main.run_live_listener())
+        try:
+            await wait_for(lambda: main.live_listener_stats["last_error"] is not None)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    run(fail_once())
+    response = api.get("/api/metrics", user_id)
+
+    assert response.status_code == 200
+    assert "secret" not in response.text
+    assert "127.0.0.1" not in response.text
+    assert response.json()["live_listener"]["last_error"] == main.live_listener_stats["last_error"]
@@ -0,0 +1,125 @@
+# tests/test_notifications.py
+from datetime import datetime, timedelta
+
+import main
+
+
+def expire_leases(run):
+    run(main.database.execute(
+        "UPDATE email_notifications SET locked_until = :past WHERE locked_until IS NOT NULL",
+        values={"past": datetime.utcnow() - timedelta(seconds=1)}
+    ))
+
+
+def notification_state(run, notification_id):
+    return run(main.database.fetch_one(
+        "SELECT processed, attempts, claim_id, failed_at FROM email_notifications WHERE id = :id",
+        values={"id": notification_id}
+    ))
+
+
+def test_claims_do_not_overlap(run, seed):
+    user_id = seed.user("alice")
+    ids = {seed.notification(user_id) for _ in range(3)}
+
+    first_claim, first = run(main.claim_email_notifications())
+    second_claim, second = run(main.claim_email_notifications())
+
+    assert {n["id"] for n in first} == ids
+    assert second == []
+    assert first_claim != second_claim
+
+
+def test_stale_owner_cannot_complete_reclaimed_rows(run, seed):
+    user_id = seed.user("alice")
+    notification_id = seed.notification(user_id)
+
+    stale_claim, _ = run(main.claim_email_notifications())
+    expire_leases(run)
+    current_claim, reclaimed = run(main.claim_email_notifications())
+    assert [n["id"] for n in reclaimed] == [notification_id]
+
+    # The first worker finishing late must not settle the second worker's rows
+    run(main.complete_email_notifications(stale_claim, [notification_id], []))
+    state = notification_state(run, notification_id)
+    assert not state["processed"]
+    assert state["claim_id"] == current_claim
+
+    run(main.complete_email_notifications(current_claim, [notification_id], []))
+    state = notification_state(run, notification_id)
+    assert state["processed"]
+    assert state["attempts"] == 2
+
+
+def test_exhausted_rows_are_dead_lettered(run, seed):
+    user_id = seed.user("alice")
+    notification_id = seed.notification(user_id, attempts=main.NOTIFICATION_MAX_ATTEMPTS - 1)
+
+    # The last attempt's worker dies without completing the batch
+    run(main.claim_email_notifications())
+    expire_leases(run)
+
+    _, claimed = run(main.claim_email_notifications())
+    assert claimed == []
+
+    run(main.dead_letter_email_notifications())
+    state = notification_state(run, notification_id)
+    assert state["processed"]
+    assert state["failed_at"] is not None
+
+
+def test_delivery_error_counts_as_failed_attempt(run, seed, monkeypatch):
+    user_id = seed.user("alice")
+    notification_id = seed.notification(user_id)
+
+    async def broken_delivery(notifications):
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(main, "deliver_email_notifications", broken_delivery)
+    try:
+        run(main.process_email_notifications())
+    except RuntimeError:
+        pass
+
+    state = run(main.database.fetch_one(
+        "SELECT processed, locked_until, last_error, scheduled_for FROM email_notifications WHERE id = :id",
+        values={"id": notification_id}
+    ))
+    assert not state["processed"]
+    assert state["locked_until"] is None
+    assert state["last_error"] == "render failed"
+    assert state["scheduled_for"] > datetime.utcnow()
+
+
+def test_game_updates_merge_into_one_claimable_digest(run, seed, monkeypatch):
+    monkeypatch.setattr(main, "GAME_UPDATE_DIGEST_WINDOW_SECONDS", -60)
+    alice = seed.user("alice")
+    league_id = seed.league("league", alice)
+    seed.sport(1)
+    games = [seed.game(1, 2024, 1, datetime.utcnow() + timedelta(days=1), espn_game_id=str(i)) for i in range(2)]
+    for game_id in games:
+        seed.pick(alice, league_id, game_id, "Home")
+
+    run(main.queue_game_update_digests([games[0]]))
+    run(main.queue_game_update_digests([games[1]]))
+
+    _, claimed = run(main.claim_email_notifications())
+    assert len(claimed) == 1
+    assert claimed[0]["notification_type"] == "GAME_UPDATED"
+    assert sorted(claimed[0]["game_ids"]) == sorted(games)
+
+
+def test_scheduled_reminders_are_claimable(run, seed):
+    alice = seed.user("alice")
+    league_id = seed.league("league", alice)
+    seed.sport(1, season=2024, week=1)
+    seed.league_sport(league_id, 1)
+    seed.game(1, 2024, 1, datetime.utcnow() + timedelta(hours=25))
+
+    run(main.schedule_pick_reminders())
+    # An hour later the reminder falls due
+    run(main.database.execute(
+        "UPDATE email_notifications SET scheduled_for = scheduled_for - interval '1 hour 1 minute'"
+    ))
+    _, claimed = run(main.claim_email_notifications())
+    assert [(n["user_id"], n["notification_type"]) for n in claimed] == [(alice, "REMIND_PICKS")]
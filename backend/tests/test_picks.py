@@ -0,0 +1,136 @@
+# tests/test_picks.py
+#
+# Pick submission resolves membership, the game, the kickoff lock and the
+# upsert in one statement; each outcome must come back from one round trip.
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+import main
+
+
+@pytest.fixture
+def slate(seed):
+    alice = seed.user("alice")
+    outsider = seed.user("mallory")
+    league_id = seed.league("league", alice)
+    seed.sport(1)
+    upcoming = seed.game(1, 2024, 1, datetime.utcnow() + timedelta(days=1), espn_game_id="upcoming")
+    started = seed.game(1, 2024, 1, datetime.utcnow() - timedelta(minutes=5), espn_game_id="started")
+    return {"alice": alice, "outsider": outsider, "league_id": league_id,
+            "upcoming": upcoming, "started": started}
+
+
+def submit(run, user_id, league_id, game_id, picked_team="Home"):
+    pick = main.PickCreate(league_id=league_id, game_id=game_id, picked_team=picked_team)
+    return run(main.submit_pick(pick, {"id": user_id}))
+
+
+def stored_picks(run, user_id):
+    rows = run(main.database.fetch_all(
+        "SELECT game_id, picked_team FROM picks WHERE user_id = :user_id", values={"user_id": user_id}
+    ))
+    return {row["game_id"]: row["picked_team"] for row in rows}
+
+
+def test_submit_then_update_in_place(run, slate, query_count):
+    result = submit(run, slate["alice"], slate["league_id"], slate["upcoming"], "Home")
+    assert result == {"message": "Pick submitted successfully"}
+    assert query_count["queries"] == 1
+
+    query_count["queries"] = 0
+    result = submit(run, slate["alice"], slate["league_id"], slate["upcoming"], "Away")
+    assert result == {"message": "Pick updated successfully"}
+    assert query_count["queries"] == 1
+
+    # Updated in place rather than duplicated
+    assert stored_picks(run, slate["alice"]) == {slate["upcoming"]: "Away"}
+
+
+@pytest.mark.parametrize("case,status_code", [
+    ("non_member", 403),
+    ("missing_game", 404),
+    ("started_game", 400),
+])
+def test_rejected_pick(run, slate, query_count, case, status_code):
+    user_id = slate["outsider"] if case == "non_member" else slate["alice"]
+    game_id = {"non_member": slate["upcoming"], "missing_game": 999999, "started_game": slate["started"]}[case]
+
+    with pytest.raises(HTTPException) as raised:
+        submit(run, user_id, slate["league_id"], game_id)
+
+    assert raised.value.status_code == status_code
+    assert query_count["queries"] == 1
+    assert stored_picks(run, user_id) == {}
+
+
+def test_started_game_keeps_its_existing_pick(run, seed, slate):
+    # Picked before kickoff; changes after kickoff are refused
+    seed.pick(slate["alice"], slate["league_id"], slate["started"], "Home")
+
+    with pytest.raises(HTTPException) as raised:
+        submit(run, slate["alice"], slate["league_id"], slate["started"], "Away")
+
+    assert raised.value.status_code == 400
+    assert stored_picks(run, slate["alice"]) == {slate["started"]: "Home"}
+
+
+def submit_batch(run, user_id, league_id, picks):
+    batch = main.PickBatch(league_id=league_id, picks=[
+        main.PickEntry(game_id=game_id, picked_team=picked_team) for game_id, picked_team in picks
+    ])
+    return run(main.submit_picks(batch, {"id": user_id}))
+
+
+def test_batch_reports_a_status_per_pick(run, seed, slate, query_count):
+    later = seed.game(1, 2024, 1, datetime.utcnow() + timedelta(days=2), espn_game_id="later")
+    seed.pick(slate["alice"], slate["league_id"], later, "Home")
+
+    query_count["queries"] = 0
+    result = submit_batch(run, slate["alice"], slate["league_id"], [
+        (slate["upcoming"], "Home"),
+        (later, "Away"),
+        (slate["started"], "Home"),
+        (999999, "Home"),
+    ])
+
+    assert [(r["game_id"], r["status"]) for r in result["results"]] == [
+        (slate["upcoming"], "submitted"),
+        (later, "updated"),
+        (slate["started"], "locked"),
+        (999999, "not_found"),
+    ]
+    assert result["message"] == "Saved 2 of 4 picks"
+    assert query_count["queries"] == 1
+    assert stored_picks(run, slate["alice"]) == {slate["upcoming"]: "Home", later: "Away"}
+
+
+def test_batch_from_a_non_member_is_forbidden(run, slate, query_count):
+    with pytest.raises(HTTPException) as raised:
+        submit_batch(run, slate["outsider"], slate["league_id"], [(slate["upcoming"], "Home")])
+
+    assert raised.value.status_code == 403
+    assert query_count["queries"] == 1
+    assert stored_picks(run, slate["outsider"]) == {}
+
+
+def test_batch_with_duplicate_games_keeps_the_last_pick(run, slate):
+    result = submit_batch(run, slate["alice"], slate["league_id"], [
+        (slate["upcoming"], "Home"),
+        (slate["upcoming"], "Away"),
+    ])
+
+    assert [(r["game_id"], r["picked_team"], r["status"]) for r in result["results"]] == [
+        (slate["upcoming"], "Away", "submitted"),
+    ]
+    assert stored_picks(run, slate["alice"]) == {slate["upcoming"]: "Away"}
+
+
+def test_batch_over_http(api, slate):
+    response = api.post("/api/picks/batch", slate["alice"], json={
+        "league_id": slate["league_id"],
+        "picks": [{"game_id": slate["upcoming"], "picked_team": "Home"}]
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["results"][0]["status"] == "submitted"
@@ -0,0 +1,47 @@
+# tests/test_query_counts.py
+#
+# Pin the number of database round trips an endpoint makes, so a per-row
+# query sneaking back into a loop shows up as a failure rather than latency.
+import pytest
+from fastapi import Response
+from starlette.requests import Request
+
+import main
+
+
+def make_request(if_none_match=None):
+    headers = []
+    if if_none_match:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/api/leagues", "headers": headers})
+
+
+def seed_leagues(seed, count):
+    viewer_id = seed.user("viewer")
+    sport_id = seed.sport()
+    for i in range(count):
+        owner_id = seed.user(f"owner{i}")
+        league_id = seed.league(f"league{i}", owner_id)
+        seed.member(league_id, viewer_id)
+        seed.league_sport(league_id, sport_id)
+    return {"id": viewer_id}
+
+
+@pytest.mark.parametrize("leagues", [1, 30])
+def test_user_leagues_round_trips_do_not_grow(run, seed, query_count, leagues):
+    user = seed_leagues(seed, leagues)
+
+    query_count["queries"] = 0
+    response = Response()
+    result = run(main.get_user_leagues(make_request(), response, user))
+
+    assert len(result["leagues"]) == leagues
+    assert all(league["member_count"] == 2 for league in result["leagues"])
+    assert query_count["queries"] == 2
+
+    # A revalidation that still matches stops after the version check
+    query_count["queries"] = 0
+    not_modified = run(main.get_user_leagues(make_request(response.headers["etag"]), Response(), user))
+
+    assert not_modified.status_code == 304
+    assert query_count["queries"] == 1
@@ -0,0 +1,119 @@
+# tests/test_query_plans.py
+#
+# Plan regression tests for the hot queries. The dataset is seeded at a
+# realistic shape and analysed, and sequential scans are disabled for the
+# EXPLAIN so the planner only falls back to one when no index can serve the
+# query; any Seq Scan left in a plan therefore means a missing index.
+from datetime import datetime, timedelta
+import uuid
+
+import pytest
+
+import main
+from conftest import truncate_tables
+
+
+@pytest.fixture(scope="module")
+def dataset(loop):
+    statements = [
+        """
+        INSERT INTO users (username, email, password_hash, created_at, updated_at)
+        SELECT 'user' || i, 'user' || i || '@example.com', 'x', now(), now()
+        FROM generate_series(1, 2000) AS i
+        """,
+        """
+        INSERT INTO sports (id, name, espn_id, current_season, current_week)
+        SELECT i, 'sport' || i, i, 2024, 1
+        FROM generate_series(1, 5) AS i
+        """,
+        """
+        INSERT INTO leagues (name, created_by, tiebreaker_enabled, invite_code, created_at, updated_at)
+        SELECT 'league' || i, i, false, 'code' || i, now(), now()
+        FROM generate_series(1, 200) AS i
+        """,
+        # Every user is in two leagues
+        """
+        INSERT INTO league_members (league_id, user_id, is_admin, joined_at)
+        SELECT ((u - 1) % 200) + 1, u, u <= 200, now() FROM generate_series(1, 2000) AS u
+        UNION ALL
+        SELECT ((u + 99) % 200) + 1, u, false, now() FROM generate_series(1, 2000) AS u
+        """,
+        """
+        INSERT INTO games (sport_id, espn_game_id, home_team, away_team, home_team_score,
+                           away_team_score, spread, favorite, game_time, venue, season, week,
+                           status, last_updated)
+        SELECT s, s || '-' || season || '-' || w || '-' || g, 'home' || g, 'away' || g, '0', '0',
+               0, '', now() + (w * interval '7 days'), 'venue', season, w, 'STATUS_SCHEDULED', now()
+        FROM generate_series(1, 5) AS s,
+             generate_series(2022, 2024) AS season,
+             generate_series(1, 18) AS w,
+             generate_series(1, 16) AS g
+        """,
+        """
+        INSERT INTO picks (user_id, league_id, game_id, picked_team, created_at, updated_at)
+        SELECT lm.user_id, lm.league_id, g.id, g.home_team, now(), now()
+        FROM league_members lm
+        JOIN games g ON g.sport_id = 1 AND g.season = 2024 AND g.week <= 4
+        WHERE lm.user_id % 4 = 0
+        """,
+        """
+        INSERT INTO league_standings (league_id, user_id, sport_id, season, week, wins, losses, ties, points)
+        SELECT lm.league_id, lm.user_id, 1, '2024', w, 1, 1, 0, 1
+        FROM league_members lm, generate_series(1, 18) AS w
+        """,
+        """
+        INSERT INTO email_notifications (user_id, notification_type, processed, scheduled_for,
+                                         created_at, attempts)
+        SELECT (i % 2000) + 1, 'REMIND_PICKS', i % 50 <> 0, now() - (i * interval '1 minute'), now(), 0
+        FROM generate_series(1, 20000) AS i
+        """,
+        "ANALYZE",
+    ]
+    loop.run_until_complete(truncate_tables())
+    for statement in statements:
+        loop.run_until_complete(main.database.execute(statement))
+
+
+async def explain(query, values):
+    async with main.database.transaction():
+        await main.database.execute("SET LOCAL enable_seqscan = off")
+        plan = await main.database.fetch_val(f"EXPLAIN (FORMAT JSON) {query}", values=values)
+    return main.json_column(plan)[0]["Plan"]
+
+
+def seq_scans(plan):
+    found = []
+    if plan["Node Type"] == "Seq Scan":
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+HOT_QUERIES = {
+    "games week lookup": (main.GAMES_WEEK_SQL, {"sport_id": 1, "season": 2024, "week": 3}),
+    "submit pick": (main.SUBMIT_PICK_SQL, {
+        "user_id": 4,
+        "league_id": 4,
+        "game_id": 10,
+        "picked_team": "home10"
+    }),
+    "membership lookup": (main.LEAGUE_ROLE_SQL, {"league_id": 4, "user_id": 4}),
+    "weekly standings": (main.WEEK_STANDINGS_SQL, {
+        "league_id": 4, "sport_id": 1, "season": "2024", "week": 3
+    }),
+    "notification claim": (main.CLAIM_NOTIFICATIONS_SQL, {
+        "now": datetime.utcnow(),
+        "lease_until": datetime.utcnow() + timedelta(minutes=5),
+        "claim_id": uuid.uuid4(),
+        "max_attempts": main.NOTIFICATION_MAX_ATTEMPTS,
+        "batch_size": main.NOTIFICATION_BATCH_SIZE
+    }),
+}
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_indexes(run, dataset, name):
+    query, values = HOT_QUERIES[name]
+    plan = run(explain(query, values))
+    assert seq_scans(plan) == [], f"{name} plan:\n{plan}"
@@ -0,0 +1,66 @@
+# tests/test_scheduler.py
+import asyncio
+
+import asyncpg
+
+import main
+from test_live_listener import wait_for
+
+
+def count_connects(monkeypatch):
+    monkeypatch.setattr(main, "SCHEDULER_LEADER_CHECK_SECONDS", 0.05)
+    connects = {"count": 0}
+    original = asyncpg.connect
+
+    async def counted(*args, **kwargs):
+        connects["count"] += 1
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(asyncpg, "connect", counted)
+    return connects
+
+
+def test_leader_notices_a_dead_lock_connection(run, monkeypatch):
+    connects = count_connects(monkeypatch)
+
+    async def scenario():
+        task = asyncio.create_task(main.run_leader_election())
+        try:
+            await wait_for(lambda: main.scheduler_leader)
+            pid = main.election_connection.get_server_pid()
+            await main.database.execute("SELECT pg_terminate_backend(:pid)", values={"pid": pid})
+            # Noticed and reacquired on a fresh connection
+            await wait_for(lambda: main.scheduler_leader
+                           and main.election_connection is not None
+                           and main.election_connection.get_server_pid() != pid)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await main.stop_scheduler()
+
+    run(scenario())
+    assert connects["count"] == 2
+    assert not main.scheduler_leader
+
+
+def test_followers_reuse_one_connection(run, monkeypatch):
+    connects = count_connects(monkeypatch)
+
+    async def scenario():
+        # Another worker holds the lock
+        holder = await asyncpg.connect(main.ASYNCPG_DSN)
+        await holder.fetchval("SELECT pg_advisory_lock($1)", main.SCHEDULER_LEADER_LOCK_KEY)
+        task = asyncio.create_task(main.run_leader_election())
+        try:
+            await asyncio.sleep(0.5)
+            assert not main.scheduler_leader
+            # It takes over once the holder goes away
+            await holder.close()
+            await wait_for(lambda: main.scheduler_leader)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await main.stop_scheduler()
+
+    run(scenario())
+    assert connects["count"] == 2  # the holder's and the election's
@@ -0,0 +1,35 @@
+# tests/test_schema.py
+#
+# conftest builds the schema from the table definitions and then migrates it,
+# and the migrations skip columns that already exist. Columns the migrations
+# declare NOT NULL with a default must therefore be declared the same way on
+# the tables, or the tests run against a looser schema than production.
+import pytest
+
+import main
+
+MIGRATED_COLUMNS = [
+    ("email_notifications", "attempts", True),
+    ("league_standings", "updated_at", True),
+    ("league_sports", "updated_at", True),
+    ("league_season_standings", "wins", True),
+    ("league_season_standings", "losses", True),
+    ("league_season_standings", "ties", True),
+    ("league_season_standings", "points", True),
+    ("league_season_standings", "rank", False),
+    ("league_season_standings", "updated_at", True),
+]
+
+
+@pytest.mark.parametrize("table,column,has_default", MIGRATED_COLUMNS)
+def test_table_definitions_match_the_migrations(run, loop, table, column, has_default):
+    row = run(main.database.fetch_one(
+        """
+        SELECT is_nullable, column_default
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = :table AND column_name = :column
+        """,
+        values={"table": table, "column": column}
+    ))
+    assert row["is_nullable"] == "NO"
+    assert (row["column_default"] is not None) == has_default
@@ -0,0 +1,117 @@
+# tests/test_standings.py
+#
+# Standings follow whatever sync says about a game, including corrections to
+# games that are already final.
+from datetime import datetime, timedelta
+
+import main
+
+SPORT = {"id": 1, "espn_id": 1, "current_season": 2024, "current_week": 1}
+
+
+def scoreboard(status, home_score=0, away_score=0, week=1):
+    return {"events": [{
+        "id": "401",
+        "date": (datetime.utcnow() + timedelta(days=1)).strftime("%Y-%m-%dT%H:%MZ"),
+        "season": {"year": 2024},
+        "week": {"number": week},
+        "status": {"type": {"name": status}},
+        "competitions": [{
+            "competitors": [
+                {"team": {"name": "Home"}, "score": home_score},
+                {"team": {"name": "Away"}, "score": away_score},
+            ],
+            "venue": {"fullName": "Stadium"},
+        }],
+    }]}
+
+
+def sync(run, status, home_score=0, away_score=0, week=1):
+    run(main.store_sport_games(SPORT, scoreboard(status, home_score, away_score, week), "20240901", "20240908"))
+
+
+def week_results(run, league_id, week=1):
+    rows = run(main.database.fetch_all(
+        """
+        SELECT u.username, s.wins, s.losses
+        FROM league_standings s JOIN users u ON u.id = s.user_id
+        WHERE s.league_id = :league_id AND s.sport_id = 1 AND s.season = '2024' AND s.week = :week
+        """,
+        values={"league_id": league_id, "week": week}
+    ))
+    return {row["username"]: (row["wins"], row["losses"]) for row in rows}
+
+
+def seed_picked_game(run, seed):
+    alice = seed.user("alice")
+    bob = seed.user("bob")
+    league_id = seed.league("league", alice)
+    seed.member(league_id, bob)
+    seed.sport(1)
+
+    sync(run, "STATUS_SCHEDULED")
+    game_id = run(main.database.fetch_val("SELECT id FROM games WHERE espn_game_id = '401'"))
+    seed.pick(alice, league_id, game_id, "Home")
+    seed.pick(bob, league_id, game_id, "Away")
+    return alice, bob, league_id
+
+
+def test_standings_follow_corrections_and_reopened_finals(run, seed):
+    alice, bob, league_id = seed_picked_game(run, seed)
+
+    sync(run, "STATUS_FINAL", 21, 14)
+    assert week_results(run, league_id) == {"alice": (1, 0), "bob": (0, 1)}
+
+    # A score correction on a game that is already final
+    sync(run, "STATUS_FINAL", 14, 21)
+    assert week_results(run, league_id) == {"alice": (0, 1), "bob": (1, 0)}
+
+    # Reopened and finalised again must not count the game twice
+    sync(run, "STATUS_IN_PROGRESS", 14, 21)
+    assert week_results(run, league_id) == {"alice": (0, 0), "bob": (0, 0)}
+    sync(run, "STATUS_FINAL", 14, 21)
+    assert week_results(run, league_id) == {"alice": (0, 1), "bob": (1, 0)}
+
+    totals = run(main.database.fetch_all(
+        "SELECT user_id, wins, losses FROM league_season_standings WHERE league_id = :league_id",
+        values={"league_id": league_id}
+    ))
+    assert {row["user_id"]: (row["wins"], row["losses"]) for row in totals} == {alice: (0, 1), bob: (1, 0)}
+
+
+def test_final_game_moved_to_another_week_leaves_its_old_week(run, seed):
+    _, _, league_id = seed_picked_game(run, seed)
+    sync(run, "STATUS_FINAL", 21, 14)
+
+    sync(run, "STATUS_FINAL", 21, 14, week=2)
+    assert week_results(run, league_id, week=1) == {"alice": (0, 0), "bob": (0, 0)}
+    assert week_results(run, league_id, week=2) == {"alice": (1, 0), "bob": (0, 1)}
+
+
+def test_moved_game_invalidates_both_weeks(run, seed):
+    seed_picked_game(run, seed)
+    old_key = main.live_games_key(1, 2024, 1)
+    new_key = main.live_games_key(1, 2024, 2)
+    for key in (old_key, new_key):
+        main.store_games_response(key, b"{}", '"tag"', 0.0)
+
+    sync(run, "STATUS_SCHEDULED", week=2)
+    assert old_key not in main.games_cache
+    assert new_key not in main.games_cache
+
+
+def test_calculate_endpoint_accepts_string_season(run, seed, api):
+    alice, bob, league_id = seed_picked_game(run, seed)
+    sync(run, "STATUS_FINAL", 21, 14)
+    run(main.database.execute("DELETE FROM league_standings"))
+
+    response = api.post("/api/standings/calculate", alice, json={
+        "league_id": league_id, "sport_id": 1, "season": "2024", "week": 1
+    })
+    assert response.status_code == 200, response.text
+    assert week_results(run, league_id) == {"alice": (1, 0), "bob": (0, 1)}
+
+    response = api.post("/api/standings/calculate", alice, json={
+        "league_id": league_id, "sport_id": 1, "season": "2024", "week": 2
+    })
+    assert response.status_code == 400
@@ -0,0 +1,36 @@
+# tests/test_versions.py
+from datetime import datetime, timedelta
+
+from fastapi import Response
+
+import main
+from test_query_counts import make_request
+
+
+class SlowClock(datetime):
+    """A worker whose clock runs an hour behind the database"""
+
+    @classmethod
+    def utcnow(cls):
+        return datetime.utcnow() - timedelta(hours=1)
+
+
+def test_version_changes_whichever_worker_clock_writes(run, seed, monkeypatch):
+    admin_id = seed.user("admin")
+    league_id = seed.league("league", admin_id)
+    seed.sport(1)
+    seed.sport(2)
+    for sports in ([1, 2], [], [1, 2]):
+        run(main.update_league_sports(league_id, main.LeagueSportUpdate(sports=sports), {"id": admin_id}))
+
+    user = {"id": admin_id}
+    response = Response()
+    run(main.get_user_leagues(make_request(), response, user))
+    etag = response.headers["etag"]
+
+    # Dropping a sport on a worker with a lagging clock must still move the version
+    monkeypatch.setattr(main, "datetime", SlowClock)
+    run(main.update_league_sports(league_id, main.LeagueSportUpdate(sports=[2]), {"id": admin_id}))
+
+    result = run(main.get_user_leagues(make_request(etag), Response(), user))
+    assert not isinstance(result, Response)